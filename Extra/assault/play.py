@@ -1,7 +1,14 @@
+import os
+import sys
 import gym
+import numpy as np
 from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 from agent import Agent
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from batch_predictor import BatchPredictor
+
 
 def main():
     input_size = 1
@@ -19,8 +26,46 @@ def main():
         next_state, reward, done, info = env.step(action)
         sleep(0.01)
 
+def evaluate(nr_of_games):
+    """ Play many games at once without rendering, sharing one loaded model through a batch predictor. """
+    input_size = 1
+    action_size = 17
+
+    agent = Agent(None, input_size, action_size, model_from_memory=True)
+    with BatchPredictor(agent.model) as predictor, ThreadPoolExecutor(max_workers=nr_of_games) as executor:
+        scores = list(executor.map(lambda seed: play_game(predictor, seed), range(nr_of_games)))
+
+    for seed, score in enumerate(scores):
+        print('[Game {}] - Score: {}'.format(seed, score))
+    print('OVERALL MEAN SCORE: {}'.format(np.mean(scores)))
+
+def play_game(predictor, seed):
+    env = gym.make('Assault-ram-v0')
+    env.seed(seed)
+    state = env.reset()
+    done = False
+    score = 0
+    first_iter = True
+    while not done:
+        if first_iter:
+            # Agent.act always plays 1 as the first action, so the evaluated policy matches the real player
+            first_iter = False
+            action = 1
+        else:
+            # The model reads every byte of the RAM as a separate row, but only the prediction of the first one is used
+            options = predictor.predict(state[:1].reshape(1, 1))
+            action = np.argmax(options[0])
+
+        state, reward, done, info = env.step(action)
+        score += reward
+    env.close()
+    return score
+
 if __name__ == '__main__':
     try:
-        main()
+        if len(sys.argv) > 2 and sys.argv[1] == '--evaluate':
+            evaluate(int(sys.argv[2]))
+        else:
+            main()
     except KeyboardInterrupt:
         print('Aborted!')
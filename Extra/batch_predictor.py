@@ -0,0 +1,113 @@
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future
+import numpy as np
+
+
+class BatchPredictor:
+    """ Serves one model to many concurrent game loops by gathering their predictions into batched forward passes. """
+
+    def __init__(self, model, max_batch_size=64, max_latency=0.005):
+        """
+        Start the worker thread that runs the forward passes.
+
+        Parameters
+        ----------
+        model : keras.Model
+            The model to predict with. It is only used from the worker thread.
+
+        max_batch_size : int
+            The maximum number of rows per forward pass.
+
+        max_latency : float
+            The maximum number of seconds the first request of a batch waits for other requests to join.
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.requests = queue.Queue()
+        self.is_closed = False
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, states):
+        """ Queue the states (with a leading batch dimension) and return a Future of their predictions. """
+        future = Future()
+        with self.lock:
+            if self.is_closed:
+                raise RuntimeError("Cannot predict with a closed BatchPredictor")
+            self.requests.put((np.asarray(states), future))
+        return future
+
+    def predict(self, states):
+        """ Blocking drop-in replacement of `model.predict(states)` for game loops running in threads. """
+        return self.submit(states).result()
+
+    async def predict_async(self, states):
+        """ Drop-in replacement of `model.predict(states)` for game loops running as asyncio tasks. """
+        return await asyncio.wrap_future(self.submit(states))
+
+    def close(self):
+        with self.lock:
+            if self.is_closed:
+                return
+            self.is_closed = True
+            self.requests.put(None)
+        self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def run(self):
+        is_closing = False
+        while not is_closing:
+            request = self.requests.get()
+            if request is None:
+                break
+
+            batch = [request]
+            batch_size = len(request[0])
+            deadline = time.monotonic() + self.max_latency
+            while batch_size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    is_closing = True
+                    break
+                batch.append(request)
+                batch_size += len(request[0])
+
+            self.predict_batch(batch)
+
+        # Nothing can be queued after closing, but fail anything that is left rather than let its caller wait forever
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request[1].set_exception(RuntimeError("The BatchPredictor was closed before this request was handled"))
+
+    def predict_batch(self, batch):
+        try:
+            predictions = np.asarray(self.model.predict_on_batch(np.concatenate([states for states, _ in batch])))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for states, future in batch:
+            future.set_result(predictions[offset:offset + len(states)])
+            offset += len(states)
@@ -10,10 +10,14 @@ from keras.models import Sequential
 from keras.layers import Dense
 from keras.optimizers import Adam
 from keras.models import load_model
-from time import sleep
+from time import sleep, perf_counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from batch_predictor import BatchPredictor
 
 class DQNCartPoleSolver():
-    def __init__(self, gamma=1.0, epsilon=1.0, epsilon_min=0.01, epsilon_log_decay=0.995, alpha=0.01, alpha_decay=0.01, batch_size=64, monitor=False, model_file=None):
+    def __init__(self, gamma=1.0, epsilon=1.0, epsilon_min=0.01, epsilon_log_decay=0.995, alpha=0.01, alpha_decay=0.01, batch_size=64, monitor=False, model_file=None, fast_train=True):
         self.memory = deque(maxlen=100000)
         self.env = gym.make('CartPole-v0')
         if monitor: self.env = gym.wrappers.Monitor(self.env, 'cartpole-1', force=True)
@@ -26,6 +30,11 @@ class DQNCartPoleSolver():
         self.n_episodes = 10000
         self.n_win_ticks = 195
         self.batch_size = batch_size
+        self.fast_train = fast_train
+
+        # Preallocated float32 minibatch buffers, so replay does not build new arrays for every training step
+        self.x_batch = np.zeros((batch_size, 4), dtype=np.float32)
+        self.y_batch = np.zeros((batch_size, 2), dtype=np.float32)
 
         # Init model
         if model_file is None:
@@ -51,19 +60,49 @@ class DQNCartPoleSolver():
         return np.reshape(state, [1, 4])
 
     def replay(self, batch_size):
-        x_batch, y_batch = [], []
         minibatch = random.sample(
             self.memory, min(len(self.memory), batch_size))
-        for state, action, reward, next_state, done in minibatch:
+        if len(minibatch) > len(self.x_batch):
+            self.x_batch = np.zeros((len(minibatch), 4), dtype=np.float32)
+            self.y_batch = np.zeros((len(minibatch), 2), dtype=np.float32)
+        x_batch, y_batch = self.x_batch[:len(minibatch)], self.y_batch[:len(minibatch)]
+        for i, (state, action, reward, next_state, done) in enumerate(minibatch):
             y_target = self.model.predict(state)
             y_target[0][action] = reward if done else reward + self.gamma * np.max(self.model.predict(next_state)[0])
-            x_batch.append(state[0])
-            y_batch.append(y_target[0])
+            x_batch[i] = state[0]
+            y_batch[i] = y_target[0]
         
-        self.model.fit(np.array(x_batch), np.array(y_batch), batch_size=len(x_batch), verbose=0)
+        self.train(x_batch, y_batch)
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
 
+    def train(self, x_batch, y_batch):
+        if self.fast_train:
+            # Calls the model's compiled train function directly, without the data adapter and callbacks fit sets up
+            # on every call. The update is the same as fit with a single batch.
+            self.model.train_on_batch(x_batch, y_batch)
+        else:
+            self.model.fit(x_batch, y_batch, batch_size=len(x_batch), verbose=0)
+
+    def benchmark_train(self, n_steps=500):
+        x_batch = np.random.uniform(-1, 1, self.x_batch.shape).astype(np.float32)
+        y_batch = np.random.uniform(-1, 1, self.y_batch.shape).astype(np.float32)
+        is_fast_train = self.fast_train
+        step_times = []
+        for fast_train in [False, True]:
+            self.fast_train = fast_train
+            # The first step builds the train function, so it is left out of the measurement
+            self.train(x_batch, y_batch)
+            start = perf_counter()
+            for _ in range(n_steps):
+                self.train(x_batch, y_batch)
+            step_times.append((perf_counter() - start) / n_steps)
+        self.fast_train = is_fast_train
+
+        print('fit: {:.3f} ms per step'.format(step_times[0] * 1000))
+        print('train_on_batch: {:.3f} ms per step'.format(step_times[1] * 1000))
+        print('Speedup: {:.1f}x'.format(step_times[0] / step_times[1]))
+
     def run(self):
         scores = deque(maxlen=100)
 
@@ -117,17 +156,50 @@ class DQNCartPoleSolver():
                 print('[Episode {}-{}] - Mean survival time: {}'.format(e - 8, e + 1, np.mean(scores)))
         print('OVERALL MEAN SURVIVAL TIME: {}'.format(np.mean(overall_scores)))
 
+    def evaluate(self, n_games):
+        # Play all games at once without rendering, sharing the model through a batch predictor
+        with BatchPredictor(self.model) as predictor, ThreadPoolExecutor(max_workers=n_games) as executor:
+            scores = list(executor.map(lambda seed: self.play_game(predictor, seed), range(n_games)))
+
+        for seed, score in enumerate(scores):
+            print('[Game {}] - Survival time: {}'.format(seed, score))
+        print('OVERALL MEAN SURVIVAL TIME: {}'.format(np.mean(scores)))
+
+    def play_game(self, predictor, seed):
+        env = gym.make('CartPole-v0')
+        env.seed(seed)
+        state = self.preprocess_state(env.reset())
+        done = False
+        i = 0
+        while not done:
+            action = np.argmax(predictor.predict(state))
+            next_state, reward, done, _ = env.step(action)
+            state = self.preprocess_state(next_state)
+            i += 1
+        env.close()
+        return i
+
 if __name__ == '__main__':
     is_testing = False
+    is_evaluating = False
+    is_benchmarking = False
     agent = None
     if len(sys.argv) > 1:
         is_testing = sys.argv[1] == "--test"
+        is_evaluating = sys.argv[1] == "--evaluate"
+        is_benchmarking = sys.argv[1] == "--benchmark"
     try:
-        if is_testing:
+        if is_benchmarking:
+            agent = DQNCartPoleSolver()
+            agent.benchmark_train()
+        elif is_testing or is_evaluating:
             file = sys.argv[2]
             if os.path.exists(file):
                 agent = DQNCartPoleSolver(model_file=file, monitor=False)
-                agent.test()
+                if is_evaluating:
+                    agent.evaluate(int(sys.argv[3]) if len(sys.argv) > 3 else 32)
+                else:
+                    agent.test()
             else:
                 raise Exception("The file {} does not exist.".format(file))
         else:
@@ -141,6 +213,6 @@ if __name__ == '__main__':
         if agent is not None:
             if agent.env is not None:
                 agent.env.close()
-        if not is_testing:
+        if not is_testing and not is_evaluating and not is_benchmarking:
             agent.model.save("model.h5")
             print("Saved model as model.h5")
@@ -0,0 +1,200 @@
+import os
+import hashlib
+import numbers
+import pickle
+import numpy as np
+import sklearn
+from sklearn.base import clone
+from sklearn.metrics import f1_score
+
+C_DEFAULT_CACHE_DIR = ".classifier_cache"
+C_DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Part of every key, so entries pickled by other library versions are never reused
+LIBRARY_VERSIONS = "numpy={} sklearn={}".format(np.__version__, sklearn.__version__)
+
+class ClassifierCache:
+    """
+    An on-disk cache of fitted classifiers, their validation scores and their predictions.
+
+    Every entry is stored as a pickle file whose name is the hash of the data, the fold, the classifier class and
+    hyper parameters and the numpy/sklearn versions. Predictions are stored under a hash of the fitted state of the
+    classifier. Classifiers with `random_state=None` are not cached, because every fit gives a different result. When
+    the total size of the cache exceeds `max_size` the least recently used entries are removed.
+    """
+
+    def __init__(self, cache_dir=C_DEFAULT_CACHE_DIR, max_size=C_DEFAULT_MAX_SIZE):
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            The directory in which the cache entries are stored. It is created if it does not exist.
+
+        max_size : int
+            The maximum total size of the cache entries in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def fit_and_score(self, clf, X, y, train_index, validation_index):
+        """
+        Clone and fit the classifier on the train fold and calculate its F1-score on the validation fold, or load both
+        from the cache if this exact combination has been fitted before.
+
+        Parameters
+        ----------
+        clf : estimator
+            The (unfitted) classifier to clone. Only its class and parameters are used. If it has a `random_state`
+            parameter that is None, the result is not cached.
+
+        X, y : np.array
+            The complete data and labels the folds are taken from.
+
+        train_index, validation_index : np.array
+            The indices of the train and validation fold.
+
+        Returns
+        -------
+        [estimator, float]
+            The fitted classifier and its weighted F1-score on the validation fold.
+        """
+        is_deterministic = self.is_deterministic(clf)
+        key = self.hash(
+            X, y, train_index, validation_index,
+            type(clf).__module__, type(clf).__qualname__, self.get_params_repr(clf)
+        )
+        entry = self.load(key) if is_deterministic else None
+        if entry is None:
+            fitted_clf = clone(clf)
+            fitted_clf.fit(X[train_index], y[train_index])
+            score = f1_score(y[validation_index], fitted_clf.predict(X[validation_index]), average="weighted")
+            entry = [fitted_clf, score]
+            if is_deterministic:
+                self.store(key, entry)
+        return entry
+
+    def predict(self, clf, X):
+        """
+        Let a fitted classifier predict the labels of X, or load the predictions from the cache.
+
+        Parameters
+        ----------
+        clf : estimator
+            The fitted classifier.
+
+        X : np.array
+            The data to predict the labels for.
+
+        Returns
+        -------
+        np.array
+            The predicted labels.
+        """
+        key = self.hash("predict", self.get_fitted_state_repr(clf), X)
+        y_pred = self.load(key)
+        if y_pred is None:
+            y_pred = clf.predict(X)
+            self.store(key, y_pred)
+        return y_pred
+
+    def clear(self):
+        for path in self.get_entry_paths():
+            self.remove(path)
+
+    def is_deterministic(self, clf):
+        params = clf.get_params(deep=True)
+        return all(value is not None for name, value in params.items()
+                   if name == "random_state" or name.endswith("__random_state"))
+
+    def get_params_repr(self, clf):
+        params = clf.get_params(deep=True)
+        return repr(sorted((name, repr(value)) for name, value in params.items()))
+
+    def get_fitted_state_repr(self, clf):
+        # The parameters and the fitted attributes (whose names end with an underscore) determine the predictions, so
+        # the predictions of a refitted classifier get a different key
+        fitted_state = ["{}={}".format(name, self.get_value_repr(value))
+                        for name, value in sorted(vars(clf).items()) if name.endswith("_")]
+        return self.hash(type(clf).__module__, type(clf).__qualname__, self.get_params_repr(clf), *fitted_state)
+
+    def get_value_repr(self, value):
+        if isinstance(value, np.ndarray) and value.dtype == object:
+            return self.hash(value.shape, *[self.get_value_repr(item) for item in value.ravel()])
+        elif isinstance(value, np.ndarray):
+            return self.hash(value)
+        elif isinstance(value, (list, tuple)):
+            return self.hash(type(value).__name__, *[self.get_value_repr(item) for item in value])
+        elif isinstance(value, dict):
+            return self.hash(*["{}={}".format(key, self.get_value_repr(item)) for key, item in sorted(value.items())])
+        elif value is None or isinstance(value, (numbers.Number, str, bytes, np.generic)):
+            return repr(value)
+        # Other objects (like loss functions) follow from the parameters, and their repr may contain a memory address
+        return type(value).__qualname__
+
+    def hash(self, *parts):
+        sha = hashlib.sha256()
+        for part in (LIBRARY_VERSIONS,) + parts:
+            if isinstance(part, np.ndarray):
+                part = np.ascontiguousarray(part)
+                sha.update("{}{}".format(part.dtype.str, part.shape).encode())
+                sha.update(part.tobytes())
+            elif isinstance(part, bytes):
+                sha.update(part)
+            else:
+                sha.update(str(part).encode())
+            sha.update(b"\0")
+        return sha.hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.cache_dir, "{}.pkl".format(key))
+
+    def get_entry_paths(self):
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".pkl")]
+
+    def load(self, key):
+        path = self.get_path(key)
+        try:
+            file = open(path, "rb")
+        except OSError:
+            return None
+        try:
+            with file:
+                entry = pickle.load(file)
+        except Exception:
+            # A corrupt entry, or one that cannot be unpickled with the installed libraries, is a miss
+            self.remove(path)
+            return None
+        # Touch the entry so it counts as recently used
+        os.utime(path)
+        return entry
+
+    def store(self, key, entry):
+        path = self.get_path(key)
+        temp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(temp_path, "wb") as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.get_entry_paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            self.remove(path)
+            total_size -= size
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
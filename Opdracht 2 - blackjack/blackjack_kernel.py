@@ -0,0 +1,236 @@
+import numpy as np
+from blackjack import C_BUST, INITIAL_CARD_POOL, Card, Hand, PlayerState, PlayerAction, PlayerVictoryState, \
+    DealerPlayStrategy, DealerStrategyGreedy, DealerStrategyReach17, card_types
+
+try:
+    from numba import njit
+    IS_COMPILED = True
+except ImportError:
+    IS_COMPILED = False
+
+    # Without numba the kernel still works (with identical results), it just runs as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+C_HIT = PlayerAction.HIT.value
+C_STAND = PlayerAction.STAND.value
+C_UNKNOWN_ACTION = -1
+
+C_WON = PlayerVictoryState.WON.value
+C_LOST_BY_POINTS = PlayerVictoryState.LOST_BY_POINTS.value
+C_LOST_BY_BUST = PlayerVictoryState.LOST_BY_BUST.value
+C_DRAW = PlayerVictoryState.DRAW.value
+
+C_GREEDY = DealerPlayStrategy.GREEDY.value
+C_REACH17 = DealerPlayStrategy.REACH17.value
+C_REACH17_POINTS_GOAL = DealerStrategyReach17.C_POINTS_GOAL
+
+C_ACE_VALUE = 11
+C_MIN_HAND_TOTAL = 4
+C_MAX_HAND_TOTAL = C_BUST - 1
+
+# The policy table is indexed by [player total, dealer revealed card value, player has usable ace]
+POLICY_TABLE_SHAPE = (C_BUST, C_ACE_VALUE + 1, 2)
+
+CARD_VALUES = np.array([card.value for card in INITIAL_CARD_POOL], dtype=np.int64)
+
+@njit(cache=True)
+def play_round(deck, policy, dealer_strategy):
+    """
+    Play a single round of blackjack with the same rules as `Game`.
+
+    Parameters
+    ----------
+    deck : np.array
+        The card values in the order in which they are dealt.
+
+    policy : np.array
+        The action (`PlayerAction` value) to perform per state, indexed by [player total, dealer revealed card value,
+        player has usable ace]. A value of -1 means the state is unknown, in which case a random action is performed.
+
+    dealer_strategy : int
+        The `DealerPlayStrategy` value of the dealer.
+
+    Returns
+    -------
+    (int, int, int)
+        The `PlayerVictoryState` value, the player total and the dealer total.
+    """
+    player_total = deck[0] + deck[2]
+    # int() is needed because adding two numpy booleans is a logical or when the kernel runs as plain Python
+    player_aces = int(deck[0] == C_ACE_VALUE) + int(deck[2] == C_ACE_VALUE)
+    dealer_total = deck[1] + deck[3]
+    dealer_aces = int(deck[1] == C_ACE_VALUE) + int(deck[3] == C_ACE_VALUE)
+    dealer_revealed_card = deck[1]
+    next_card = 4
+
+    if player_total >= C_BUST:
+        player_total -= 10
+        player_aces -= 1
+
+    while True:
+        action = policy[player_total, dealer_revealed_card, 1 if player_aces > 0 else 0]
+        if action == C_UNKNOWN_ACTION:
+            action = np.random.randint(0, 2)
+        if action == C_STAND:
+            break
+
+        card = deck[next_card]
+        next_card += 1
+        player_total += card
+        if card == C_ACE_VALUE:
+            player_aces += 1
+        while player_aces > 0 and player_total >= C_BUST:
+            player_total -= 10
+            player_aces -= 1
+        if player_total >= C_BUST:
+            return C_LOST_BY_BUST, player_total, dealer_total
+
+    if dealer_total >= C_BUST:
+        dealer_total -= 10
+        dealer_aces -= 1
+
+    while dealer_total < player_total and (dealer_strategy == C_GREEDY or dealer_total < C_REACH17_POINTS_GOAL):
+        card = deck[next_card]
+        next_card += 1
+        dealer_total += card
+        if card == C_ACE_VALUE:
+            dealer_aces += 1
+        while dealer_aces > 0 and dealer_total >= C_BUST:
+            dealer_total -= 10
+            dealer_aces -= 1
+
+    if dealer_total >= C_BUST:
+        return C_WON, player_total, dealer_total
+    elif player_total < dealer_total:
+        return C_LOST_BY_POINTS, player_total, dealer_total
+    elif player_total > dealer_total:
+        return C_WON, player_total, dealer_total
+    else:
+        return C_DRAW, player_total, dealer_total
+
+@njit(cache=True)
+def play_rounds(decks, policy, dealer_strategy):
+    """
+    Play a round of blackjack for every deck.
+
+    Parameters
+    ----------
+    decks : np.array
+        A matrix with a deck (see `play_round`) per row.
+
+    policy : np.array
+        The policy table (see `play_round`).
+
+    dealer_strategy : int
+        The `DealerPlayStrategy` value of the dealer.
+
+    Returns
+    -------
+    np.array
+        A matrix with the `PlayerVictoryState` value, the player total and the dealer total per round.
+    """
+    results = np.empty((decks.shape[0], 3), dtype=np.int64)
+    for i in range(decks.shape[0]):
+        victory_state, player_total, dealer_total = play_round(decks[i], policy, dealer_strategy)
+        results[i, 0] = victory_state
+        results[i, 1] = player_total
+        results[i, 2] = dealer_total
+    return results
+
+@njit(cache=True)
+def seed_compiled_random(seed):
+    # Compiled functions have their own random number generator, which can only be seeded from compiled code
+    np.random.seed(seed)
+
+def seed_random(seed):
+    """
+    Seed the random number generator the compiled kernel uses for the actions in unknown states.
+
+    Without numba the kernel runs as plain Python and uses the global numpy generator. That one is left alone so the
+    randomness of the rest of the notebook is not reset, which means the random actions can then not be reproduced.
+
+    Parameters
+    ----------
+    seed : int
+        The seed to use.
+    """
+    if IS_COMPILED:
+        seed_compiled_random(seed)
+
+def shuffle_decks(nr_of_rounds, random_state=None):
+    """
+    Create a shuffled deck of card values for every round.
+
+    Parameters
+    ----------
+    nr_of_rounds : int
+        The number of decks to create.
+
+    random_state : np.random.RandomState
+        The random number generator to shuffle with. Uses the global numpy generator if None.
+
+    Returns
+    -------
+    np.array
+        A matrix with a shuffled deck per row.
+    """
+    random_state = np.random if random_state is None else random_state
+    order = np.argsort(random_state.random_sample((nr_of_rounds, len(CARD_VALUES))), axis=1)
+    return CARD_VALUES[order]
+
+def get_dealer_strategy(game):
+    if isinstance(game.dealer_strategy, DealerStrategyGreedy):
+        return C_GREEDY
+    return C_REACH17
+
+def create_hand(total, has_usable_ace):
+    cards_by_value = {card.value: card for card in card_types}
+    hand = Hand()
+    if has_usable_ace:
+        hand.add_card(Card("Ace", C_ACE_VALUE))
+        total -= C_ACE_VALUE
+        if total == 1:
+            hand.add_card(Card("Ace", 1))
+            return hand
+    while total > 0:
+        value = min(10, total - 2) if total > 10 or not hand.cards else total
+        hand.add_card(Card(cards_by_value[value].name, value))
+        total -= value
+    return hand
+
+def create_policy_table(Q_table, State):
+    """
+    Convert a Q-Table to a policy table that can be used by `play_round`.
+
+    The player states are reconstructed from the player total, the dealer revealed card and whether the player has a
+    usable ace. This only gives the same actions as the Q-Table if your State does not depend on anything else (like
+    the individual cards in the player's hand or the remaining cards).
+
+    Parameters
+    ----------
+    Q_table : dict
+        The Q-Table containing the action-state weights.
+
+    State : class
+        The class that creates a textual representation of the game state.
+
+    Returns
+    -------
+    np.array
+        The policy table.
+    """
+    policy = np.full(POLICY_TABLE_SHAPE, C_UNKNOWN_ACTION, dtype=np.int64)
+    dealer_revealed_cards = {card.value: card for card in card_types}
+    for has_usable_ace in [False, True]:
+        min_total = C_ACE_VALUE + 1 if has_usable_ace else C_MIN_HAND_TOTAL
+        for player_total in range(min_total, C_MAX_HAND_TOTAL + 1):
+            for dealer_card_value, dealer_revealed_card in dealer_revealed_cards.items():
+                player_state = PlayerState(create_hand(player_total, has_usable_ace), dealer_revealed_card,
+                                           INITIAL_CARD_POOL)
+                actions = Q_table.get(State(player_state).__str__())
+                if actions is not None:
+                    policy[player_total, dealer_card_value, int(has_usable_ace)] = np.argmax(actions)
+    return policy
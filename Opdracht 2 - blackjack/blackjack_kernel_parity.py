@@ -0,0 +1,81 @@
+import sys
+import numpy as np
+from blackjack import Game, DealerPlayStrategy, PlayerAction, INITIAL_CARD_POOL
+from blackjack_kernel import POLICY_TABLE_SHAPE, play_rounds, shuffle_decks, create_policy_table
+
+class State:
+
+    def __init__(self, player_state):
+        self.player_total = player_state.player_hand.calculate_total()
+        self.dealer_card_value = player_state.dealer_revealed_card.value
+        self.has_usable_ace = player_state.player_hand.has_usable_ace()
+
+    def __str__(self):
+        return "{}_{}_{}".format(self.player_total, self.dealer_card_value, self.has_usable_ace)
+
+class DeckGame(Game):
+    """ A game that deals its cards in the order of a given deck instead of at random. """
+
+    def __init__(self, dealer_strategy):
+        super().__init__(dealer_strategy)
+        self.deck = []
+
+    def deal_card(self):
+        value = self.deck.pop(0)
+        for i, card in enumerate(self.card_pool):
+            if card.value == value:
+                return self.card_pool.pop(i)
+
+def create_random_q_table(random_state):
+    Q_table = dict()
+    for player_total in range(POLICY_TABLE_SHAPE[0]):
+        for dealer_card_value in range(POLICY_TABLE_SHAPE[1]):
+            for has_usable_ace in [False, True]:
+                Q_table["{}_{}_{}".format(player_total, dealer_card_value, has_usable_ace)] = \
+                    list(random_state.random_sample(len(PlayerAction)))
+    return Q_table
+
+def play_game_round(game, Q_table, deck):
+    game.deck = list(deck)
+    state = State(game.next_round())
+    done = False
+    while not done:
+        action = PlayerAction(np.argmax(Q_table[state.__str__()]))
+        player_state, round_state = game.act(action)
+        state = State(player_state)
+        done = round_state.has_round_ended
+    return [round_state.player_victory_state.value, round_state.player_total, round_state.dealer_total]
+
+def check_parity(nr_of_rounds=20000, seed=1):
+    """
+    Play the same decks with `Game` and with the compiled kernel and count the rounds with a different outcome.
+
+    Parameters
+    ----------
+    nr_of_rounds : int
+        The number of rounds to play per dealer strategy.
+
+    seed : int
+        The seed for the decks and the Q-Table.
+
+    Returns
+    -------
+    int
+        The number of mismatches over all dealer strategies.
+    """
+    random_state = np.random.RandomState(seed)
+    Q_table = create_random_q_table(random_state)
+    policy = create_policy_table(Q_table, State)
+    mismatches = 0
+    for dealer_strategy in DealerPlayStrategy:
+        game = DeckGame(dealer_strategy)
+        decks = shuffle_decks(nr_of_rounds, random_state)
+        results = play_rounds(decks, policy, dealer_strategy.value)
+        strategy_mismatches = sum(play_game_round(game, Q_table, deck) != list(result)
+                                  for deck, result in zip(decks, results))
+        print("{}: {} mismatches over {} rounds".format(dealer_strategy, strategy_mismatches, nr_of_rounds))
+        mismatches += strategy_mismatches
+    return mismatches
+
+if __name__ == '__main__':
+    sys.exit(1 if check_parity() > 0 else 0)
@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 import random
 from blackjack import PlayerVictoryState, PlayerAction, get_action_name
+from blackjack_kernel import C_WON, C_DRAW, play_rounds, shuffle_decks, create_policy_table, get_dealer_strategy, \
+    seed_random
 import matplotlib.pyplot as plt
 import seaborn as sns
 sns.set(style="darkgrid")
@@ -67,13 +69,49 @@ def choose_action(Q_table, state, epsilon):
         else:
             return PlayerAction(np.argmax(actions))
 
-def test_algorithm(game, Q_table, State, show_steps=True):
+def test_algorithm(game, Q_table, State, show_steps=True, compiled=False, seed=1):
+    """
+    Test the Q-Table by playing 10 iterations of 1000 rounds and plot the victory rates per iteration.
+
+    Parameters
+    ----------
+    game : Game
+        The game to play.
+
+    Q_table : dict
+        The Q-Table containing the action-state weights.
+
+    State : class
+        The class that creates a textual representation of the game state.
+
+    show_steps : bool
+        Whether to log every action the actor makes. Must be False when compiled is True.
+
+    compiled : bool
+        Whether to play the rounds with the compiled kernel from `blackjack_kernel` instead of the game. This is a lot
+        faster, but only valid if your State depends on nothing more than the player total, the dealer revealed card and
+        whether the player has a usable ace.
+
+    seed : int
+        The seed for the decks and the random actions of the compiled kernel (the game itself is seeded by the
+        `blackjack` module). It does not change the global numpy generator. Use None to get different results on every
+        call.
+    """
     lowest_win_draw_ratio = 100
     highest_win_draw_ratio = 0
     avg_victory_rates = []
     nr_of_iterations = 10
     nr_of_rounds = 1000
     
+    if compiled:
+        if show_steps:
+            raise ValueError("show_steps is not supported by the compiled kernel, use show_steps=False")
+        random_state = np.random.RandomState(seed)
+        if seed is not None:
+            seed_random(seed)
+        policy = create_policy_table(Q_table, State)
+        dealer_strategy = get_dealer_strategy(game)
+    
     for iteration in range(nr_of_iterations):
         print()
         print("==================================================")
@@ -84,45 +122,51 @@ def test_algorithm(game, Q_table, State, show_steps=True):
         draws = 0
         victory_rates = []
 
-        for episode in range(nr_of_rounds):
-            if show_steps:
-                print()
-                print("=========================")
-                print("NEW ROUND")
-                print("=========================")
-            current_state_ = game.next_round()
-            current_state = State(current_state_)
-            done = False
-
-            while not done:
-                action = choose_action(Q_table, current_state, 0)
-                next_state_, round_state = game.act(action)
-                next_state = State(next_state_)
-
+        if compiled:
+            victory_states = play_rounds(shuffle_decks(nr_of_rounds, random_state), policy, dealer_strategy)[:, 0]
+            wins = int(np.sum(victory_states == C_WON))
+            draws = int(np.sum(victory_states == C_DRAW))
+            losses = nr_of_rounds - wins - draws
+        else:
+            for episode in range(nr_of_rounds):
                 if show_steps:
                     print()
-                    print(f"state: {current_state}")
-                    print(f"action: {get_action_name(action)}")
-                    print(f"result: {round_state}")
-
-
-                done = round_state.has_round_ended
-                current_state = next_state
-
-                if done:
-                    player_victory_state = round_state.player_victory_state
-                    if player_victory_state == PlayerVictoryState.WON:
-                        wins += 1
-                    elif player_victory_state == PlayerVictoryState.DRAW:
-                        draws += 1
-                    else:
-                        losses += 1
-
-                    victory_rates.append([
-                        wins / (episode + 1) * 100,
-                        losses / (episode + 1) * 100,
-                        draws / (episode + 1) * 100
-                    ])
+                    print("=========================")
+                    print("NEW ROUND")
+                    print("=========================")
+                current_state_ = game.next_round()
+                current_state = State(current_state_)
+                done = False
+
+                while not done:
+                    action = choose_action(Q_table, current_state, 0)
+                    next_state_, round_state = game.act(action)
+                    next_state = State(next_state_)
+
+                    if show_steps:
+                        print()
+                        print(f"state: {current_state}")
+                        print(f"action: {get_action_name(action)}")
+                        print(f"result: {round_state}")
+
+
+                    done = round_state.has_round_ended
+                    current_state = next_state
+
+                    if done:
+                        player_victory_state = round_state.player_victory_state
+                        if player_victory_state == PlayerVictoryState.WON:
+                            wins += 1
+                        elif player_victory_state == PlayerVictoryState.DRAW:
+                            draws += 1
+                        else:
+                            losses += 1
+
+                        victory_rates.append([
+                            wins / (episode + 1) * 100,
+                            losses / (episode + 1) * 100,
+                            draws / (episode + 1) * 100
+                        ])
 
         win_ratio = wins / nr_of_rounds * 100
         loss_ratio = losses / nr_of_rounds * 100